@@ -5,7 +5,9 @@ Job Monitor - Мониторинг вакансий с отправкой в Tel
 """
 
 import os
+import copy
 import json
+import functools
 import sqlite3
 import logging
 import asyncio
@@ -13,13 +15,14 @@ import argparse
 import hashlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from urllib.parse import urljoin, urlparse
+import ahocorasick
 import aiohttp
 import feedparser
-from bs4 import BeautifulSoup
-import schedule
-import time
+import lxml.etree
+import lxml.html
+from cssselect import HTMLTranslator
 from dotenv import load_dotenv
 
 # Загрузка переменных окружения
@@ -36,6 +39,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int):
+    # mtime_ns входит в ключ кеша: правка файла инвалидирует запись
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_json(path: str):
+    """Чтение JSON-файла с кешем по (путь, время изменения).
+
+    Повторная инициализация JobMonitor не перечитывает и не перепарсивает
+    неизменившиеся конфигурационные файлы. Наружу отдается глубокая копия:
+    load_config дописывает в ресурсы скомпилированные селекторы, и правки
+    не должны попадать в закешированный объект.
+    """
+    return copy.deepcopy(_load_json_cached(path, os.stat(path).st_mtime_ns))
+
 @dataclass
 class Job:
     """Структура данных для вакансии"""
@@ -48,137 +67,381 @@ class Job:
     tags: str = ""
     published: Optional[datetime] = None
     created_at: datetime = None
-    
+    # Мемо-поле: не участвует в __init__/__repr__/__eq__, это кеш, а не данные
+    _hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
-    
+
     def to_dict(self) -> Dict:
         """Преобразование в словарь для сохранения в БД"""
         data = asdict(self)
+        data.pop('_hash', None)
         if self.published:
             data['published'] = self.published.isoformat()
         if self.created_at:
             data['created_at'] = self.created_at.isoformat()
         return data
     
-    def get_hash(self) -> str:
-        """Получение уникального хеша для дедупликации"""
-        unique_string = f"{self.title}|{self.link}|{self.source}"
-        return hashlib.md5(unique_string.encode()).hexdigest()
+    def get_hash(self) -> bytes:
+        """Получение уникального хеша для дедупликации.
+
+        BLAKE2b заметно быстрее MD5, а 16 сырых байт вместо 32 hex-символов
+        вдвое уменьшают индекс idx_hash. Результат кешируется на экземпляре.
+        """
+        if self._hash is None:
+            unique_string = f"{self.title}|{self.link}|{self.source}"
+            self._hash = hashlib.blake2b(unique_string.encode(), digest_size=16).digest()
+        return self._hash
+
+def build_automaton(words: List[str]) -> Optional['ahocorasick.Automaton']:
+    """Компиляция списка слов в автомат Ахо-Корасик.
+
+    Один линейный проход по тексту вместо поиска каждого слова по отдельности.
+    """
+    if not words:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
 
-class JobLocationFilter:
-    """Фильтр вакансий по местоположению"""
+def automaton_matches(automaton: Optional['ahocorasick.Automaton'], text: str) -> bool:
+    """Проверка, встречается ли в тексте хотя бы одно слово автомата"""
+    if automaton is None:
+        return False
+    return next(automaton.iter(text), None) is not None
 
-    def __init__(self, allowed_locations: List[str]):
-        # Приводим все разрешенные локации к нижнему регистру для удобства сравнения
+class CombinedFilter:
+    """Объединенный фильтр по ключевым словам и местоположению.
+
+    Текст вакансии приводится к нижнему регистру ровно один раз,
+    обе проверки выполняются автоматами Ахо-Корасик.
+    """
+
+    def __init__(self, keywords: List[str], allowed_locations: List[str]):
+        self.keywords = [kw.lower() for kw in keywords]
         self.allowed_locations = [loc.lower() for loc in allowed_locations]
+        self._keyword_automaton = build_automaton(self.keywords)
+        self._location_automaton = build_automaton(self.allowed_locations)
 
-    def is_location_allowed(self, job: Job) -> bool:
+    def accepts(self, job: Job) -> bool:
+        """Проверка вакансии по местоположению и ключевым словам за один проход"""
+        # Сначала локация — строка короче, отсев дешевле
         location = (job.location or '').lower()
-        return any(allowed in location for allowed in self.allowed_locations)
+        if not automaton_matches(self._location_automaton, location):
+            return False
+
+        text_to_check = f"{job.title} {job.description} {job.tags}".lower()
+        return automaton_matches(self._keyword_automaton, text_to_check)
+
+# Колонки TIMESTAMP конвертируются в datetime внутри C-модуля sqlite3,
+# без datetime.fromisoformat на каждую строку в Python
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
 
 class DatabaseManager:
     """Менеджер базы данных SQLite"""
-    
+
+    # Поля Job в порядке схемы — для выборок, из которых строятся Job(**row)
+    JOB_COLUMNS = ("j.title, j.description, j.link, j.source, j.location, "
+                   "j.company, j.tags, j.published, j.created_at")
+
     def __init__(self, db_path: str = "jobs.db"):
         self.db_path = db_path
+        # Одно соединение на всё время жизни менеджера: код однопоточный (asyncio),
+        # а открытие соединения на каждый запрос сбрасывает кеш страниц SQLite
+        self.conn = sqlite3.connect(
+            db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row
+        self._apply_pragmas(self.conn)
         self.init_db()
+
+    def close(self):
+        """Закрытие соединения с БД"""
+        self.conn.close()
     
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection):
+        """Настройка SQLite на интенсивную запись.
+
+        WAL + synchronous=NORMAL убирают fsync на каждый INSERT (WAL создает
+        рядом с БД файлы -wal/-shm — это нормально). Остальные PRAGMA увеличивают
+        кеш страниц и переносят временные структуры в память.
+        """
+        conn.execute("PRAGMA page_size=4096")  # действует только до первой записи в новую БД
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 МБ (отрицательное значение = КиБ)
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=60000")
+
+    # Схема основной таблицы — используется и в init_db, и при миграции
+    CREATE_JOBS_SQL = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            link TEXT NOT NULL,
+            source TEXT NOT NULL,
+            location TEXT,
+            company TEXT,
+            tags TEXT,
+            published TIMESTAMP,
+            created_at TIMESTAMP NOT NULL,
+            hash BLOB UNIQUE NOT NULL,
+            sent_to_telegram BOOLEAN DEFAULT FALSE
+        )
+    """
+
+    def _migrate_legacy_schema(self) -> bool:
+        """Одноразовая миграция БД со старой схемой (hash TEXT с MD5-hex).
+
+        Хеши пересчитываются в BLAKE2b-BLOB, иначе уже виденные вакансии не
+        дедуплицируются, а колонки времени получают тип TIMESTAMP для
+        конвертеров PARSE_DECLTYPES. Переименование, копирование и удаление
+        старой таблицы идут одной явной транзакцией: сбой на любом шаге
+        откатывает всё и не оставляет БД без истории вакансий.
+        Возвращает True, если миграция была выполнена.
+        """
+        row = self.conn.execute(
+            "SELECT type FROM pragma_table_info('jobs') WHERE name = 'hash'"
+        ).fetchone()
+        if row is None or row[0].upper() == 'BLOB':
+            return False
+
+        logger.info("Обнаружена старая схема jobs.db, выполняю миграцию...")
+        conn = self.conn
+        try:
+            # Явный BEGIN: модуль sqlite3 не открывает транзакцию вокруг DDL сам
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ALTER TABLE jobs RENAME TO jobs_legacy")
+            conn.execute("DROP TABLE IF EXISTS jobs_fts")
+            conn.execute(self.CREATE_JOBS_SQL)
+
+            rows = conn.execute("""
+                SELECT title, description, link, source, location, company,
+                       tags, published, created_at, sent_to_telegram
+                FROM jobs_legacy
+            """).fetchall()
+            conn.executemany("""
+                INSERT OR IGNORE INTO jobs (title, description, link, source, location,
+                                company, tags, published, created_at, hash, sent_to_telegram)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    row['title'], row['description'], row['link'], row['source'],
+                    row['location'], row['company'], row['tags'], row['published'],
+                    row['created_at'],
+                    sqlite3.Binary(Job(title=row['title'], description=row['description'],
+                                       link=row['link'], source=row['source']).get_hash()),
+                    row['sent_to_telegram']
+                )
+                for row in rows
+            ])
+            conn.execute("DROP TABLE jobs_legacy")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(f"Миграция завершена: перенесено {len(rows)} вакансий")
+        return True
+
     def init_db(self):
         """Инициализация базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
+        migrated = self._migrate_legacy_schema()
+
+        with self.conn as conn:
+            conn.execute(self.CREATE_JOBS_SQL)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_hash ON jobs(hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at)")
+            # Частичный индекс только по неотправленным строкам: горячая выборка
+            # get_new_jobs не зависит от количества уже отправленных вакансий.
+            # Запросы обязаны писать sent_to_telegram = 0 (не FALSE): SQLite
+            # сопоставляет предикат частичного индекса текстуально
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS jobs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    link TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    location TEXT,
-                    company TEXT,
-                    tags TEXT,
-                    published TEXT,
-                    created_at TEXT NOT NULL,
-                    hash TEXT UNIQUE NOT NULL,
-                    sent_to_telegram BOOLEAN DEFAULT FALSE
+                CREATE INDEX IF NOT EXISTS idx_unsent ON jobs(created_at)
+                WHERE sent_to_telegram = 0
+            """)
+
+            # Полнотекстовый индекс по вакансиям: MATCH в SQL вместо
+            # построчного поиска подстрок в Python
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    title, description, tags,
+                    content='jobs', content_rowid='id'
                 )
             """)
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_hash ON jobs(hash)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at)")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                    INSERT INTO jobs_fts(rowid, title, description, tags)
+                    VALUES (new.id, new.title, new.description, new.tags);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, tags)
+                    VALUES ('delete', old.id, old.title, old.description, old.tags);
+                END
+            """)
+            # Только индексируемые колонки: флаг sent_to_telegram меняется на каждом
+            # цикле отправки и не должен переписывать полнотекстовую запись.
+            # DROP покрывает БД, где триггер успел создаться без списка колонок
+            conn.execute("DROP TRIGGER IF EXISTS jobs_fts_update")
+            conn.execute("""
+                CREATE TRIGGER jobs_fts_update
+                AFTER UPDATE OF title, description, tags ON jobs BEGIN
+                    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, tags)
+                    VALUES ('delete', old.id, old.title, old.description, old.tags);
+                    INSERT INTO jobs_fts(rowid, title, description, tags)
+                    VALUES (new.id, new.title, new.description, new.tags);
+                END
+            """)
+            # Мигрированные строки вставлялись до создания триггеров —
+            # полнотекстовый индекс пересобирается из основной таблицы
+            if migrated:
+                conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
+
+            # Свежая статистика, чтобы планировщик выбирал частичный индекс
+            conn.execute("ANALYZE")
             conn.commit()
     
     def add_job(self, job: Job) -> bool:
         """Добавление вакансии в БД. Возвращает True если добавлена, False если дубликат"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                job_data = job.to_dict()
-                job_data['hash'] = job.get_hash()
-                
-                conn.execute("""
-                    INSERT INTO jobs (title, description, link, source, location, 
-                                    company, tags, published, created_at, hash)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    job_data['title'], job_data['description'], job_data['link'],
-                    job_data['source'], job_data['location'], job_data['company'],
-                    job_data['tags'], job_data['published'], job_data['created_at'],
-                    job_data['hash']
-                ))
-                conn.commit()
-                return True
-        except sqlite3.IntegrityError:
-            # Дубликат - уже существует
-            return False
-    
-    def get_new_jobs(self, hours: int = 24) -> List[Job]:
-        """Получение новых вакансий за последние N часов"""
+        return self.add_jobs([job]) == 1
+
+    def add_jobs(self, jobs: List[Job]) -> int:
+        """Пакетное добавление вакансий одной транзакцией.
+
+        Дубликаты пропускаются через INSERT OR IGNORE без исключений.
+        Возвращает количество реально добавленных вакансий.
+        """
+        if not jobs:
+            return 0
+
+        rows = []
+        for job in jobs:
+            job_data = job.to_dict()
+            rows.append((
+                job_data['title'], job_data['description'], job_data['link'],
+                job_data['source'], job_data['location'], job_data['company'],
+                job_data['tags'], job_data['published'], job_data['created_at'],
+                sqlite3.Binary(job.get_hash())
+            ))
+
+        with self.conn as conn:
+            # rowcount курсора — только реально вставленные строки; total_changes
+            # не годится: он учитывает и записи FTS5-триггеров в теневые таблицы
+            cursor = conn.executemany("""
+                INSERT OR IGNORE INTO jobs (title, description, link, source, location,
+                                company, tags, published, created_at, hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        return cursor.rowcount
+    
+    def get_new_jobs(self, hours: int = 24, keywords: Optional[List[str]] = None) -> List[Job]:
+        """Получение новых вакансий за последние N часов.
+
+        Если переданы ключевые слова, отбор делается через FTS5 MATCH
+        прямо в SQL — без перебора подстрок в Python.
+        """
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM jobs 
-                WHERE created_at > ? AND sent_to_telegram = FALSE
+
+        if keywords:
+            # Фраза в кавычках + '*' — префиксное совпадение последнего токена
+            match_query = " OR ".join(
+                '"{}" *'.format(kw.replace('"', '""')) for kw in keywords
+            )
+            cursor = self.conn.execute(f"""
+                SELECT {self.JOB_COLUMNS}, j.hash FROM jobs_fts f
+                JOIN jobs j ON j.id = f.rowid
+                WHERE jobs_fts MATCH ? AND j.created_at > ? AND j.sent_to_telegram = 0
+                ORDER BY j.created_at DESC
+            """, (match_query, cutoff_time.isoformat()))
+        else:
+            cursor = self.conn.execute(f"""
+                SELECT {self.JOB_COLUMNS}, j.hash FROM jobs j
+                WHERE created_at > ? AND sent_to_telegram = 0
                 ORDER BY created_at DESC
             """, (cutoff_time.isoformat(),))
-            
-            jobs = []
-            for row in cursor.fetchall():
-                job = Job(
-                    title=row['title'],
-                    description=row['description'],
-                    link=row['link'],
-                    source=row['source'],
-                    location=row['location'],
-                    company=row['company'],
-                    tags=row['tags'],
-                    published=datetime.fromisoformat(row['published']) if row['published'] else None,
-                    created_at=datetime.fromisoformat(row['created_at'])
-                )
-                jobs.append(job)
-            
-            return jobs
+
+        # Колонки выбраны по полям Job, TIMESTAMP уже сконвертированы в datetime.
+        # Хеш берем из БД, чтобы не пересчитывать его на пути отправки
+        jobs = []
+        for row in cursor.fetchall():
+            data = dict(row)
+            job_hash = data.pop('hash')
+            job = Job(**data)
+            job._hash = job_hash
+            jobs.append(job)
+
+        return jobs
     
-    def mark_as_sent(self, job_hashes: List[str]):
+    def mark_as_sent(self, job_hashes: List[bytes]):
         """Отметить вакансии как отправленные в Telegram"""
-        with sqlite3.connect(self.db_path) as conn:
-            for job_hash in job_hashes:
-                conn.execute("UPDATE jobs SET sent_to_telegram = TRUE WHERE hash = ?", (job_hash,))
-            conn.commit()
+        # Один UPDATE ... IN (...) вместо запроса на каждый хеш;
+        # чанки по 900 из-за лимита SQLite на число параметров (999)
+        chunk_size = 900
+        with self.conn as conn:
+            for start in range(0, len(job_hashes), chunk_size):
+                chunk = job_hashes[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(
+                    f"UPDATE jobs SET sent_to_telegram = TRUE WHERE hash IN ({placeholders})",
+                    chunk
+                )
 
 class JobParser:
     """Парсер вакансий из различных источников"""
     
+    # Селекторы по умолчанию (DOU)
+    DEFAULT_SELECTORS = {
+        'container': '.vacancy',
+        'title': 'div.title a.vt',
+        'description': 'div.sh-info',
+        'location': 'span.cities'
+    }
+
+    _css_translator = HTMLTranslator()
+
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
-    
+
+    @classmethod
+    def compile_selectors(cls, selectors: Dict[str, str]) -> Dict[str, 'lxml.etree.XPath']:
+        """Однократная компиляция CSS-селекторов в XPath.
+
+        Выполняется при загрузке конфигурации, чтобы не переводить CSS в XPath
+        заново на каждую страницу.
+        """
+        merged = {**cls.DEFAULT_SELECTORS, **selectors}
+        return {
+            key: lxml.etree.XPath(cls._css_translator.css_to_xpath(value))
+            for key, value in merged.items()
+        }
+
+    @staticmethod
+    def _text(elements) -> str:
+        """Нормализованный текст первого найденного элемента"""
+        if not elements:
+            return ''
+        return ' '.join(elements[0].text_content().split())
+
     async def parse_rss(self, url: str, source_name: str) -> List[Job]:
         """Парсинг RSS-ленты"""
         try:
             async with self.session.get(url) as response:
-                content = await response.text()
-                
+                # Сырые байты: feedparser сам определяет кодировку,
+                # двойное декодирование через response.text() не нужно
+                content = await response.read()
+
             feed = feedparser.parse(content)
             jobs = []
             
@@ -197,34 +460,44 @@ class JobParser:
             logger.error(f"Ошибка парсинга RSS {url}: {e}")
             return []
     
-    async def parse_html(self, url: str, source_name: str, selectors: Dict[str, str]) -> List[Job]: 
-    #"""Парсинг HTML-страницы с кастомными селекторами (адаптировано под DOU)"""
+    async def parse_html(self, url: str, source_name: str,
+                         compiled_selectors: Dict[str, 'lxml.etree.XPath']) -> List[Job]:
+        """Парсинг HTML-страницы скомпилированными XPath-выражениями (адаптировано под DOU)"""
         try:
             headers = {"User-Agent": "Mozilla/5.0 (compatible; JobBot/1.0)"}
-            async with self.session.get(url, headers=headers) as response:
-                content = await response.text()
 
-            soup = BeautifulSoup(content, 'html.parser')
+            # Потоковый парсинг: чанки уходят в lxml по мере чтения,
+            # тело страницы не буферизуется целиком в памяти
+            async with self.session.get(url, headers=headers) as response:
+                # Кодировку берем из заголовков HTTP: без нее libxml2 угадывает
+                # и портит кириллицу на страницах без <meta charset>.
+                # response.charset (а не get_encoding) — без charset в Content-Type
+                # он возвращает None, и libxml2 определяет кодировку сам
+                html_parser = lxml.html.HTMLParser(encoding=response.charset)
+                async for chunk in response.content.iter_chunked(65536):
+                    html_parser.feed(chunk)
+            tree = html_parser.close()
             jobs = []
 
             # Поиск контейнеров с вакансиями
-            job_containers = soup.select(selectors.get('container', '.vacancy'))
-
-            for container in job_containers:
-                title_elem = container.select_one(selectors.get('title', 'div.title a.vt'))
+            for container in compiled_selectors['container'](tree):
+                title_elem = compiled_selectors['title'](container)
                 link_elem = title_elem  # В DOU ссылка в том же элементе, что и заголовок
-                desc_elem = container.select_one(selectors.get('description', 'div.sh-info'))
+                desc_elem = compiled_selectors['description'](container)
                 company_elem = desc_elem  # В DOU описание содержит и компанию
-                location_elem = container.select_one(selectors.get('location', 'span.cities'))
+                location_elem = compiled_selectors['location'](container)
+
+                title = self._text(title_elem)
+                description = self._text(desc_elem)
 
-                if title_elem and link_elem:
+                if title:
                     job = Job(
-                        title=title_elem.get_text(strip=True),
-                        description=desc_elem.get_text(strip=True) if desc_elem else '',
-                        link=urljoin(url, link_elem.get('href', '')),
+                        title=title,
+                        description=description,
+                        link=urljoin(url, link_elem[0].get('href') or ''),
                         source=source_name,
-                        company=company_elem.get_text(strip=True).split('—')[0] if company_elem else '',
-                        location=location_elem.get_text(strip=True) if location_elem else ''
+                        company=description.split('—')[0] if company_elem else '',
+                        location=self._text(location_elem)
                     )
                     jobs.append(job)
 
@@ -236,17 +509,6 @@ class JobParser:
             return []
 
 
-class JobFilter:
-    """Фильтр вакансий по ключевым словам"""
-    
-    def __init__(self, keywords: List[str]):
-        self.keywords = [kw.lower() for kw in keywords]
-    
-    def matches(self, job: Job) -> bool:
-        """Проверка соответствия вакансии ключевым словам"""
-        text_to_check = f"{job.title} {job.description} {job.tags}".lower()
-        return any(keyword in text_to_check for keyword in self.keywords)
-
 class TelegramBot:
     """Клиент для отправки сообщений в Telegram"""
     
@@ -256,7 +518,21 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{token}"
         self.max_message_length = 4096
         self.config = config or {}
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Ленивое создание одной сессии с keep-alive вместо сессии на каждое сообщение"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=75)
+            )
+        return self._session
+
+    async def close(self):
+        """Закрытие HTTP-сессии при завершении работы"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     async def send_message(self, text: str, parse_mode: str = "Markdown") -> bool:
         """Отправка сообщения в Telegram"""
         try:
@@ -267,14 +543,14 @@ class TelegramBot:
                 "parse_mode": parse_mode,
                 "disable_web_page_preview": True
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status == 200:
-                        return True
-                    else:
-                        logger.error(f"Ошибка отправки в Telegram: {response.status}")
-                        return False
+
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status == 200:
+                    return True
+                else:
+                    logger.error(f"Ошибка отправки в Telegram: {response.status}")
+                    return False
         except Exception as e:
             logger.error(f"Ошибка отправки сообщения в Telegram: {e}")
             return False
@@ -320,55 +596,66 @@ class TelegramBot:
                 jobs_by_source[job.source] = []
             jobs_by_source[job.source].append(job)
         
-        # Формирование дайджеста
+        # Формирование дайджеста. Длину отслеживаем счетчиком и копим куски
+        # в списках — без повторной склейки всего дайджеста на каждой итерации
         digest_parts = [header]
+        total_len = len(header)
+        length_limit = self.max_message_length - 200  # Оставляем запас
         max_jobs_per_source = self.config.get('max_jobs_per_source', 10)
-        
+
         for source, source_jobs in jobs_by_source.items():
-            source_section = f"📂 *{source}* ({len(source_jobs)} вакансий)\n"
-            
+            section_header = f"📂 *{source}* ({len(source_jobs)} вакансий)\n"
+            section_parts = [section_header]
+            section_len = len(section_header)
+
             # Ограничиваем количество вакансий на источник
             displayed_jobs = source_jobs[:max_jobs_per_source]
-            
+
             for i, job in enumerate(displayed_jobs, 1):
                 location = ""
                 company = ""
-                
+
                 if self.config.get('show_location', True) and job.location:
                     location = f" 🌍 {job.location}"
-                
+
                 if self.config.get('show_company', True) and job.company:
                     company = f" 🏢 {job.company}"
-                
+
                 job_line = f"{i}. [{job.title}]({job.link}){location}{company}\n"
-                
+
                 # Добавляем описание если включено
                 if self.config.get('include_description', False) and job.description:
                     desc_preview = job.description[:100] + "..." if len(job.description) > 100 else job.description
                     job_line += f"   _{desc_preview}_\n"
-                
+
                 # Проверяем, не превысит ли добавление этой вакансии лимит
-                test_digest = "".join(digest_parts) + source_section + job_line
-                if len(test_digest) > self.max_message_length - 200:  # Оставляем запас
+                if total_len + section_len + len(job_line) > length_limit:
                     if len(source_jobs) > len(displayed_jobs):
-                        source_section += f"   ... и еще {len(source_jobs) - i + 1} вакансий\n"
+                        tail_line = f"   ... и еще {len(source_jobs) - i + 1} вакансий\n"
+                        section_parts.append(tail_line)
+                        section_len += len(tail_line)
                     break
                 else:
-                    source_section += job_line
-            
+                    section_parts.append(job_line)
+                    section_len += len(job_line)
+
             # Показываем сколько вакансий скрыто
             if len(source_jobs) > max_jobs_per_source:
                 hidden_count = len(source_jobs) - max_jobs_per_source
-                source_section += f"   ... и еще {hidden_count} вакансий\n"
-            
-            source_section += "\n"
-            digest_parts.append(source_section)
-            
+                hidden_line = f"   ... и еще {hidden_count} вакансий\n"
+                section_parts.append(hidden_line)
+                section_len += len(hidden_line)
+
+            section_parts.append("\n")
+            section_len += 1
+            digest_parts.append("".join(section_parts))
+            total_len += section_len
+
             # Проверяем общий размер
-            if len("".join(digest_parts)) > self.max_message_length - 200:
+            if total_len > length_limit:
                 digest_parts.append("📝 *Дайджест сокращен из-за ограничений Telegram*")
                 break
-        
+
         return "".join(digest_parts)
     
     async def send_digest(self, digest: str) -> bool:
@@ -377,18 +664,21 @@ class TelegramBot:
             return await self.send_message(digest)
         
         # Если дайджест слишком длинный, разбиваем на части
-        success_count = 0
         parts = self.split_digest(digest)
-        
+        success_count = 0
+
+        # В один чат части идут последовательно: сохраняется порядок "(i/N)"
+        # и соблюдается лимит Telegram ~1 сообщение/сек на чат. Выигрыш
+        # по времени дает переиспользуемая keep-alive сессия
         for i, part in enumerate(parts):
             part_header = f"📋 *Дайджест ({i+1}/{len(parts)})*\n\n" if len(parts) > 1 else ""
-            message = part_header + part
-            
-            if await self.send_message(message):
+
+            if await self.send_message(part_header + part):
                 success_count += 1
-            
-            await asyncio.sleep(1)  # Задержка между сообщениями
-        
+
+            if i + 1 < len(parts):
+                await asyncio.sleep(1)  # Задержка между сообщениями
+
         return success_count == len(parts)
     
     def split_digest(self, digest: str) -> List[str]:
@@ -428,8 +718,7 @@ class JobMonitor:
             chat_id=os.getenv('TELEGRAM_CHAT_ID'),
             config=self.config.get('telegram', {})
         )
-        self.job_filter = JobFilter(self.keywords)
-        self.location_filter = JobLocationFilter(["gdansk", "remote", "poland"])
+        self.job_filter = CombinedFilter(self.keywords, ["gdansk", "remote", "poland"])
         self.stats = {
             'total_viewed': 0,
             'total_added': 0,
@@ -439,22 +728,27 @@ class JobMonitor:
     def load_config(self):
         """Загрузка конфигурации из файлов"""
         try:
-            with open('resources.json', 'r', encoding='utf-8') as f:
-                self.resources = json.load(f)
+            self.resources = load_json('resources.json')
         except FileNotFoundError:
             logger.warning("Файл resources.json не найден. Используется пустой список.")
             self.resources = []
-        
+
+        # CSS-селекторы компилируются в XPath один раз на всё время работы
+        for resource in self.resources:
+            if resource.get('type') == 'html':
+                resource['compiled_selectors'] = JobParser.compile_selectors(
+                    resource.get('selectors', {})
+                )
+
+
         try:
-            with open('keywords.json', 'r', encoding='utf-8') as f:
-                self.keywords = json.load(f)
+            self.keywords = load_json('keywords.json')
         except FileNotFoundError:
             logger.warning("Файл keywords.json не найден. Используется пустой список.")
             self.keywords = []
         
         try:
-            with open('config.json', 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            self.config = load_json('config.json')
         except FileNotFoundError:
             logger.warning("Файл config.json не найден. Используется конфигурация по умолчанию.")
             self.config = {
@@ -476,43 +770,69 @@ class JobMonitor:
         """Сканирование всех источников вакансий"""
         logger.info("Начинаю сканирование источников...")
         
-        async with aiohttp.ClientSession() as session:
+        # Ограничение сокетов на хост + кеш DNS: пропускная способность
+        # сохраняется, пиковая память и число соединений — под контролем
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=4,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            resolver=aiohttp.AsyncResolver()
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
             parser = JobParser(session)
-            
-            for resource in self.resources:
-                try:
-                    jobs = []
-                    
-                    if resource['type'] == 'rss':
-                        jobs = await parser.parse_rss(resource['url'], resource['name'])
-                    elif resource['type'] == 'html':
-                        jobs = await parser.parse_html(
-                            resource['url'], 
-                            resource['name'], 
-                            resource.get('selectors', {})
-                        )
-                    
-                    # Фильтрация и добавление в БД
-                    for job in jobs:
-                        self.stats['total_viewed'] += 1
-                        
-                        if self.job_filter.matches(job) and self.location_filter.is_location_allowed(job):
-                            if self.db.add_job(job):
-                                self.stats['total_added'] += 1
-                                logger.info(f"Добавлена вакансия: {job.title}")
-                    
-                    logger.info(f"Обработан источник {resource['name']}: {len(jobs)} вакансий")
-                    
-                except Exception as e:
-                    logger.error(f"Ошибка обработки источника {resource['name']}: {e}")
-        
+
+            async def fetch_resource(resource: Dict) -> List[Job]:
+                if resource['type'] == 'rss':
+                    return await parser.parse_rss(resource['url'], resource['name'])
+                elif resource['type'] == 'html':
+                    return await parser.parse_html(
+                        resource['url'],
+                        resource['name'],
+                        resource['compiled_selectors']
+                    )
+                return []
+
+            # Все источники опрашиваются параллельно — латентность не суммируется
+            results = await asyncio.gather(
+                *(fetch_resource(resource) for resource in self.resources),
+                return_exceptions=True
+            )
+
+        # Вставки в БД делаем последовательно: SQLite — однописательная
+        for resource, result in zip(self.resources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка обработки источника {resource['name']}: {result}")
+                continue
+
+            jobs = result
+
+            # Фильтрация; вставка в БД — одной транзакцией на источник
+            accepted = []
+            for job in jobs:
+                self.stats['total_viewed'] += 1
+
+                if self.job_filter.accepts(job):
+                    accepted.append(job)
+
+            added = self.db.add_jobs(accepted)
+            self.stats['total_added'] += added
+
+            logger.info(f"Обработан источник {resource['name']}: {len(jobs)} вакансий, добавлено {added}")
+
+
         logger.info(f"Сканирование завершено. Просмотрено: {self.stats['total_viewed']}, добавлено: {self.stats['total_added']}")
     
+    async def close(self):
+        """Освобождение ресурсов при завершении работы"""
+        await self.telegram_bot.close()
+        self.db.close()
+
     async def send_daily_report(self):
         """Отправка ежедневного отчета в Telegram"""
         logger.info("Отправляю ежедневный отчет...")
         
-        new_jobs = self.db.get_new_jobs(24)
+        new_jobs = self.db.get_new_jobs(24, keywords=self.keywords)
         
         if not new_jobs:
             await self.telegram_bot.send_message("📋 Новых вакансий за последние 24 часа не найдено.")
@@ -594,23 +914,54 @@ async def main():
         return
     
     monitor = JobMonitor()
-    
+
+    try:
+        await run_monitor(monitor, args)
+    finally:
+        await monitor.close()
+
+def seconds_until_report(report_time: str, now: Optional[datetime] = None) -> float:
+    """Количество секунд до ближайшего времени отчета вида 'HH:MM'"""
+    now = now or datetime.now()
+    hour, minute = map(int, report_time.split(':'))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+async def scan_loop(monitor: 'JobMonitor', interval_hours: int):
+    """Периодическое сканирование источников внутри одной event loop"""
+    while True:
+        await monitor.scan_all_sources()
+        await asyncio.sleep(interval_hours * 3600)
+
+async def report_loop(monitor: 'JobMonitor', report_time: str):
+    """Ежедневная отправка отчета в заданное время"""
+    while True:
+        await asyncio.sleep(seconds_until_report(report_time))
+        await monitor.send_daily_report()
+
+async def run_monitor(monitor: 'JobMonitor', args):
+    """Выполнение выбранного режима работы"""
     if args.report:
         await monitor.send_daily_report()
     elif args.scan:
         await monitor.scan_all_sources()
     elif args.daemon:
         logger.info("Запуск в режиме демона...")
-        
-        # Планирование задач
-        schedule.every().hour.do(lambda: asyncio.run(monitor.scan_all_sources()))
-        schedule.every().day.at("09:00").do(lambda: asyncio.run(monitor.send_daily_report()))
-        
-        logger.info("Демон запущен. Сканирование каждый час, отчет в 9:00")
-        
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+
+        # Одна долгоживущая event loop: БД и HTTP-сессии переживают запуски,
+        # вместо schedule + asyncio.run на каждый тик
+        scheduler_config = monitor.config.get('scheduler', {})
+        interval_hours = scheduler_config.get('scan_interval_hours', 1)
+        report_time = scheduler_config.get('report_time', '09:00')
+
+        logger.info(f"Демон запущен. Сканирование каждые {interval_hours} ч, отчет в {report_time}")
+
+        await asyncio.gather(
+            scan_loop(monitor, interval_hours),
+            report_loop(monitor, report_time)
+        )
     else:
         # Разовое выполнение
         await monitor.scan_all_sources()